@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+import io
+import logging
+import os
+import tempfile
+
+
+def get_default_directory():
+    """
+    Return default directory to store validator reports, it follows
+    ``XDG_CACHE_HOME`` environment variable if defined.
+
+    Returns:
+        string: Absolute directory path.
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"),
+        ".cache"
+    )
+
+    return os.path.join(base, "py-html-checker")
+
+
+class ReportCache:
+    """
+    Store validator reports in files from a directory, so they are kept
+    between runs.
+
+    Cache is safe to share between threads and processes since each report
+    file is written at once.
+
+    Keyword Arguments:
+        directory (string): Directory path where to store reports, it is
+            created if it does not exist yet. Default to ``None`` to use
+            directory from ``get_default_directory``.
+    """
+    def __init__(self, directory=None):
+        self.log = logging.getLogger("py-html-checker")
+        self.directory = directory or get_default_directory()
+
+    def get_path(self, key):
+        """
+        Return report file path for given key.
+
+        Arguments:
+            key (string): Report key.
+
+        Returns:
+            string: Report file path.
+        """
+        return os.path.join(self.directory, "{}.json".format(key))
+
+    def get(self, key):
+        """
+        Return stored report for given key.
+
+        Arguments:
+            key (string): Report key.
+
+        Returns:
+            bytes: Stored report if any, else ``None``.
+        """
+        try:
+            with io.open(self.get_path(key), "rb") as fp:
+                return fp.read()
+        except OSError:
+            return None
+
+    def set(self, key, value):
+        """
+        Store report for given key.
+
+        A report which can not be written is only logged since cache is not
+        required to validate.
+
+        Arguments:
+            key (string): Report key.
+            value (bytes): Report to store.
+        """
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+
+            # Write to a temporary file then move it so a report file is never
+            # read partially
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with io.open(fd, "wb") as fp:
+                    fp.write(value)
+                os.replace(tmp_path, self.get_path(key))
+            except OSError:
+                os.remove(tmp_path)
+                raise
+        except OSError as e:
+            msg = "Unable to write report to cache: {}"
+            self.log.warning(msg.format(e))
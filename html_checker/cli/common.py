@@ -1,4 +1,5 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 import click
 
@@ -9,6 +10,34 @@ from html_checker.export import EXPORTER_CHOICES
 
 # Shared options arguments
 COMMON_OPTIONS = {
+    "cache": {
+        "args": ("--cache",),
+        "kwargs": {
+            "is_flag": True,
+            "help": (
+                "Store validator reports for local files in "
+                "'~/.cache/py-html-checker/' so unchanged files are not "
+                "validated again from the next runs. Cache is not used with "
+                "'--server'."
+            ),
+            "default": False,
+        }
+    },
+    "cds-archive": {
+        "args": ("--cds-archive",),
+        "kwargs": {
+            "type": click.Path(dir_okay=False),
+            "metavar": "FILEPATH",
+            "help": (
+                "File path to a Java class data sharing archive for a faster "
+                "validator startup. If the file does not exist, it will be "
+                "created from the first validator execution then used from "
+                "the next runs. This requires Java>=13 and is ignored from "
+                "older versions."
+            ),
+            "default": None,
+        }
+    },
     "destination": {
         "args": ("--destination",),
         "type": click.Path(),
@@ -24,6 +53,32 @@ COMMON_OPTIONS = {
             "default": None,
         }
     },
+    "fast-startup": {
+        "args": ("--fast-startup/--no-fast-startup",),
+        "kwargs": {
+            "default": False,
+            "help": (
+                "Enable Java options for a faster validator startup at the "
+                "expense of validation speed. It may be useful for a few "
+                "paths but not for a large path list. It has no effect with "
+                "'--server' option. Default is disabled."
+            ),
+        }
+    },
+    "jobs": {
+        "args": ("--jobs",),
+        "kwargs": {
+            "type": click.IntRange(min=1),
+            "metavar": "INTEGER",
+            "default": 1,
+            "help": (
+                "Number of validator instances to run concurrently, paths "
+                "are evenly batched over them. This only has effect with "
+                "'--split' option. Default is '1' so every path is validated "
+                "in a single instance."
+            ),
+        }
+    },
     "pack": {
         "args": ("--pack/--no-pack",),
         "kwargs": {
@@ -49,6 +104,17 @@ COMMON_OPTIONS = {
             "default": "logging",
         }
     },
+    "no-langdetect": {
+        "args": ("--no-langdetect",),
+        "kwargs": {
+            "is_flag": True,
+            "help": (
+                "Disables language detection, so that documents are not "
+                "checked for missing or mislabeled html[lang] attributes. "
+                "This makes validation faster. Not supported with '--server'."
+            ),
+        }
+    },
     "no-stream": {
         "args": ("--no-stream",),
         "kwargs": {
@@ -72,6 +138,20 @@ COMMON_OPTIONS = {
             ),
         }
     },
+    "server": {
+        "args": ("--server",),
+        "kwargs": {
+            "is_flag": True,
+            "help": (
+                "Run a single validator server instance and request it for "
+                "every path instead of starting a new validator instance for "
+                "each validation. This is faster for many paths, mostly with "
+                "'--split' option. Validator options '--no-langdetect', "
+                "'--no-stream' and '--user-agent' are not supported in this "
+                "mode and are ignored."
+            ),
+        }
+    },
     "source": {
         "args": ("--source/--no-source",),
         "kwargs": {
@@ -88,11 +168,11 @@ COMMON_OPTIONS = {
         "kwargs": {
             "is_flag": True,
             "help": (
-                "Execute validation for each path in its own distinct instance. "
-                "Useful for very large path list which may take too long to "
-                "display anything until every path has been validated. However, "
-                "for small or moderate path list it will be longer than unique "
-                "instance."
+                "Build a distinct report for each path. Paths are batched "
+                "over as many validator instances as '--jobs' value, so with "
+                "default value there is still a single validator instance "
+                "for all paths. A failed batch is validated again path by "
+                "path."
             ),
         }
     },
@@ -159,3 +239,156 @@ def validate_sitemap_path(logger, path):
             return False
 
     return True
+
+
+def get_routines(paths, split=False, jobs=1):
+    """
+    Distribute paths into routines, each routine is a path list validated in
+    its own validator instance.
+
+    Arguments:
+        paths (list): List of paths to validate.
+
+    Keyword Arguments:
+        split (bool): If enabled, paths are distributed in as many routines
+            as jobs, else there is a single routine for every paths. Default
+            to ``False``.
+        jobs (int): Maximum number of validations to run concurrently.
+            Default to ``1``.
+
+    Returns:
+        list: List of routines.
+    """
+    if not split:
+        return [paths[:]]
+
+    # Distribute paths in as many contiguous batches as possible workers, the
+    # first batches get one more path when it can not be evenly divided
+    count = min(jobs, len(paths))
+    if count == 0:
+        return []
+
+    size, remainder = divmod(len(paths), count)
+
+    routines = []
+    start = 0
+    for i in range(count):
+        end = start + size + (1 if i < remainder else 0)
+        routines.append(paths[start:end])
+        start = end
+
+    return routines
+
+
+def validate_routines(validator, routines, interpreter_options, tool_options,
+                      jobs=1, server=False, split=False):
+    """
+    Perform validation for each routine and yield their report registry.
+
+    Routines are distributed over a pool of threads since each one mostly
+    waits for its validator process to finish. Registries are always yielded
+    in the same order than given routines.
+
+    In split mode, routine registry is divided to yield a registry for each
+    path. If validation of a routine fails, its paths are validated again one
+    by one so a failure only concerns its own path.
+
+    Exceptions from ``validator.catched_exception`` are turned to a registry
+    with a critical message, every other exception is raised. If server can
+    not be started, a single registry with a critical message is yielded.
+
+    Server does not support validator tool options, they are ignored with a
+    warning.
+
+    Arguments:
+        validator (html_checker.validator.ValidatorInterface): Validator
+            interface instance to perform validations.
+        routines (list): List of path lists, each path list is validated in
+            its own validator instance.
+        interpreter_options (dict): Dict of interpreter arguments.
+        tool_options (dict): Dict of validator tool arguments.
+
+    Keyword Arguments:
+        jobs (int): Maximum number of validations to run concurrently.
+            Default to ``1``.
+        server (bool): If enabled, a validator server is started and used for
+            every routine, then stopped once every routine is done. Default
+            to ``False``.
+        split (bool): If enabled, a registry is yielded for each path instead
+            of each routine. Default to ``False``.
+
+    Yields:
+        dict: Report registry for a routine or a path.
+    """
+    if server and tool_options:
+        msg = "Validator options are not supported with server, ignored: {}"
+        validator.log.warning(msg.format(", ".join(tool_options)))
+
+    # Apply default options once, so concurrent validations won't have to
+    # modify shared option dicts
+    interpreter_options, tool_options = validator.manage_options(
+        interpreter_options,
+        tool_options
+    )
+
+    def validate_routine(paths):
+        # Keep failures isolated to their path in split mode
+        if split and len(paths) > 1:
+            try:
+                report = validator.validate(
+                    paths[:],
+                    interpreter_options=interpreter_options,
+                    tool_options=tool_options,
+                    raise_failure=True
+                )
+            except validator.catched_exception:
+                msg = "Validation failed for a batch of {} paths, validating "
+                msg += "them one by one"
+                validator.log.warning(msg.format(len(paths)))
+
+                registry = {}
+                for path in paths:
+                    registry.update(validate_routine([path]))
+
+                return registry
+
+            return report.registry
+
+        try:
+            report = validator.validate(
+                paths,
+                interpreter_options=interpreter_options,
+                tool_options=tool_options
+            )
+        except validator.catched_exception as e:
+            return {
+                "all": [{
+                    "type": "critical",
+                    "message": e,
+                }]
+            }
+
+        return report.registry
+
+    if server:
+        try:
+            validator.start_server(interpreter_options=interpreter_options)
+        except validator.catched_exception as e:
+            yield {
+                "all": [{
+                    "type": "critical",
+                    "message": e,
+                }]
+            }
+            return
+
+    try:
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            for registry in executor.map(validate_routine, routines):
+                if split:
+                    for path, messages in registry.items():
+                        yield {path: messages}
+                else:
+                    yield registry
+    finally:
+        validator.stop_server()
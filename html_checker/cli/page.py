@@ -1,11 +1,11 @@
 # -*- coding: utf-8 -*-
 import logging
 
-from collections import OrderedDict
-
 import click
 
-from html_checker.cli.common import COMMON_OPTIONS
+from html_checker.cache import get_default_directory
+from html_checker.cli.common import (COMMON_OPTIONS, get_routines,
+                                     validate_routines)
 from html_checker.exceptions import (HtmlCheckerUnexpectedException,
                                      HtmlCheckerBaseException)
 from html_checker.export import get_exporter
@@ -14,16 +14,28 @@ from html_checker.utils import reduce_unique, write_documents
 
 
 @click.command()
+@click.option(*COMMON_OPTIONS["cache"]["args"],
+              **COMMON_OPTIONS["cache"]["kwargs"])
+@click.option(*COMMON_OPTIONS["cds-archive"]["args"],
+              **COMMON_OPTIONS["cds-archive"]["kwargs"])
 @click.option(*COMMON_OPTIONS["destination"]["args"],
               **COMMON_OPTIONS["destination"]["kwargs"])
 @click.option(*COMMON_OPTIONS["exporter"]["args"],
               **COMMON_OPTIONS["exporter"]["kwargs"])
+@click.option(*COMMON_OPTIONS["fast-startup"]["args"],
+              **COMMON_OPTIONS["fast-startup"]["kwargs"])
+@click.option(*COMMON_OPTIONS["jobs"]["args"],
+              **COMMON_OPTIONS["jobs"]["kwargs"])
+@click.option(*COMMON_OPTIONS["no-langdetect"]["args"],
+              **COMMON_OPTIONS["no-langdetect"]["kwargs"])
 @click.option(*COMMON_OPTIONS["no-stream"]["args"],
               **COMMON_OPTIONS["no-stream"]["kwargs"])
 @click.option(*COMMON_OPTIONS["pack"]["args"],
               **COMMON_OPTIONS["pack"]["kwargs"])
 @click.option(*COMMON_OPTIONS["safe"]["args"],
               **COMMON_OPTIONS["safe"]["kwargs"])
+@click.option(*COMMON_OPTIONS["server"]["args"],
+              **COMMON_OPTIONS["server"]["kwargs"])
 @click.option(*COMMON_OPTIONS["split"]["args"],
               **COMMON_OPTIONS["split"]["kwargs"])
 @click.option(*COMMON_OPTIONS["template-dir"]["args"],
@@ -34,8 +46,9 @@ from html_checker.utils import reduce_unique, write_documents
               **COMMON_OPTIONS["xss"]["kwargs"])
 @click.argument('paths', nargs=-1, required=True)
 @click.pass_context
-def page_command(context, destination, exporter, no_stream, pack, safe, split,
-                 template_dir, user_agent, xss, paths):
+def page_command(context, cache, cds_archive, destination, exporter,
+                 fast_startup, jobs, no_langdetect, no_stream, pack, safe,
+                 server, split, template_dir, user_agent, xss, paths):
     """
     Validate given page paths.
 
@@ -70,10 +83,13 @@ def page_command(context, destination, exporter, no_stream, pack, safe, split,
         CatchedException = HtmlCheckerUnexpectedException
 
     # Tools options
-    interpreter_options = OrderedDict([])
-    tool_options = OrderedDict([])
+    interpreter_options = {}
+    tool_options = {}
     exporter_options = {}
 
+    if no_langdetect:
+        tool_options["--no-langdetect"] = None
+
     if no_stream:
         tool_options["--no-stream"] = None
 
@@ -87,8 +103,13 @@ def page_command(context, destination, exporter, no_stream, pack, safe, split,
         key = "-Xss{}".format(xss)
         interpreter_options[key] = None
 
+    cache_dir = get_default_directory() if cache else None
+
     # Start validator interface and exporter instance
-    v = ValidatorInterface(exception_class=CatchedException)
+    v = ValidatorInterface(exception_class=CatchedException,
+                           fast_startup=fast_startup,
+                           cds_archive=cds_archive,
+                           cache_dir=cache_dir)
 
     # Start exporter instance
     exporter = get_exporter(exporter)(**exporter_options)
@@ -100,24 +121,14 @@ def page_command(context, destination, exporter, no_stream, pack, safe, split,
         if hasattr(exporter, "template_dir"):
             logger.debug("Using template directory: {}".format(exporter.template_dir))
 
-    # Keep packed paths or split them depending 'split' option
-    routines = [reduced_paths[:]]
-    if split:
-        routines = [[v] for v in reduced_paths]
+    # Keep packed paths or batch them depending 'split' and 'jobs' options
+    routines = get_routines(reduced_paths, split=split, jobs=jobs)
 
     # Get report from validator process to build export
-    for item in routines:
-        try:
-            report = v.validate(item, interpreter_options=interpreter_options,
-                                tool_options=tool_options)
-            exporter.build(report.registry)
-        except CatchedException as e:
-            exporter.build({
-                "all": [{
-                    "type": "critical",
-                    "message": e,
-                }]
-            })
+    for registry in validate_routines(v, routines, interpreter_options,
+                                      tool_options, jobs=jobs,
+                                      server=server, split=split):
+        exporter.build(registry)
 
     # Release documents if exporter supports it
     export = exporter.release(pack=pack)
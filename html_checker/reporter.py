@@ -2,11 +2,19 @@
 import json
 import logging
 import os
-from collections import OrderedDict
 
 from html_checker.exceptions import ReportError
 from html_checker.utils import is_local_ressource
 
+# Use the fastest available JSON decoder, they all accept byte strings
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    try:
+        from ujson import loads as json_loads
+    except ImportError:
+        json_loads = json.loads
+
 
 class ReportStore:
     """
@@ -18,7 +26,7 @@ class ReportStore:
         self.log = logging.getLogger("py-html-checker")
 
         self.paths = paths
-        self.registry = OrderedDict(
+        self.registry = dict(
             self.initial_registry(self.paths)
         )
 
@@ -70,20 +78,23 @@ class ReportStore:
         Returns:
             object: Object decoded from JSON string.
         """
-        # Decode returned byte string from process output JSON
-        content = content.decode("utf-8").strip()
-
-        # Try to load and validate report JSON
+        # Try to load and validate report JSON, byte string is given as it is
+        # to avoid a decoded copy of the whole report
         try:
-            content = json.loads(content)
-        except json.decoder.JSONDecodeError as e:
-            msg = "Invalid JSON report: {}"
-            raise ReportError(msg.format(e))
-        else:
-            if "messages" not in content:
-                msg = ("Invalid JSON report: it must contains a 'messages' item "
-                       "of checked page list.")
-                raise ReportError(msg)
+            content = json_loads(content)
+        except ValueError:
+            # Fallback to standard library which is less strict and gives the
+            # same error message whatever decoder is used
+            try:
+                content = json.loads(content)
+            except json.decoder.JSONDecodeError as e:
+                msg = "Invalid JSON report: {}"
+                raise ReportError(msg.format(e))
+
+        if "messages" not in content:
+            msg = ("Invalid JSON report: it must contains a 'messages' item "
+                   "of checked page list.")
+            raise ReportError(msg)
 
         return content
 
@@ -106,26 +117,26 @@ class ReportStore:
         else:
             messages = content
 
-        # To retain already outputed error messages for unknow paths
-        already_seen_errors = []
+        registry = self.registry
+
+        # To retain unknow paths which have already been warned about
+        unknow_paths = set()
 
-        # Walk report to find message about required path to check and store
-        # them
+        # Walk report once to group messages on their required path, each
+        # message is dispatched with a registry lookup
         for item in messages:
-            path = item.get("url")
-            item.pop("url")
+            path = item.pop("url")
 
             # Clean prefix file path from reported path
             if path.startswith("file:"):
                 path = path[len("file:"): + 1].replace("%20", " ")
                 path = os.path.abspath(path)
 
-            if path in self.registry:
-                if self.registry[path] is None:
-                    self.registry[path] = []
-                self.registry[path].append(item)
-            else:
+            if path in registry:
+                if registry[path] is None:
+                    registry[path] = []
+                registry[path].append(item)
+            elif path not in unknow_paths:
+                unknow_paths.add(path)
                 msg = "Validator report contains unknow path '{}'".format(path)
-                if msg not in already_seen_errors:
-                    already_seen_errors.append(msg)
-                    self.log.warning(msg)
+                self.log.warning(msg)
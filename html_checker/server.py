@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+import atexit
+import io
+import logging
+import os
+import socket
+import subprocess
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.exceptions import RequestException
+
+from html_checker import USER_AGENT
+from html_checker.exceptions import ValidatorError
+from html_checker.utils import is_url
+
+
+class VnuServer:
+    """
+    Validator server manager.
+
+    Run a single validator web service process which can be requested for many
+    paths, so the Java interpreter is started only once.
+
+    It can be used as a context manager which starts server on enter and
+    stops it on exit.
+
+    Attributes:
+        HOST (string): Host address to bind the server to.
+        STARTUP_TIMEOUT (integer): Maximum time in seconds to wait for server
+            to be reachable.
+        STARTUP_INTERVAL (float): Time in seconds to wait between each
+            reachability check while server is starting.
+        POOL_SIZE (integer): Maximum number of connections to keep alive to
+            server, it should be at least the number of concurrent requests.
+        REQUEST_TIMEOUT (integer): Maximum time in seconds to wait for server
+            to respond to a validation request.
+
+    Arguments:
+        validator (html_checker.validator.ValidatorInterface): Validator
+            interface to build server command line.
+
+    Keyword Arguments:
+        interpreter_options (dict): Dict of interpreter arguments to include
+            in server command line. Default is ``None``.
+    """
+    HOST = "127.0.0.1"
+    STARTUP_TIMEOUT = 60
+    STARTUP_INTERVAL = 0.2
+    POOL_SIZE = 32
+    REQUEST_TIMEOUT = 300
+
+    def __init__(self, validator, interpreter_options=None):
+        self.log = logging.getLogger("py-html-checker")
+        self.validator = validator
+        self.interpreter_options = interpreter_options
+        self.process = None
+        self.endpoint = None
+        self.session = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def get_free_port(self):
+        """
+        Find a free port on server host.
+
+        Returns:
+            integer: Port number.
+        """
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.bind((self.HOST, 0))
+            return sock.getsockname()[1]
+
+    def get_session(self):
+        """
+        Build HTTP session to share connections between every request to
+        server.
+
+        Returns:
+            requests.Session: HTTP session.
+        """
+        session = requests.Session()
+        session.headers["User-Agent"] = USER_AGENT
+
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.POOL_SIZE)
+        session.mount("http://", adapter)
+
+        return session
+
+    def is_ready(self):
+        """
+        Check if server responds to requests.
+
+        Returns:
+            bool: True if server responded, else False.
+        """
+        try:
+            self.session.get(self.endpoint, timeout=self.STARTUP_INTERVAL)
+        except RequestException:
+            return False
+
+        return True
+
+    def start(self):
+        """
+        Start server process and wait until it is reachable.
+
+        Raises:
+            ValidatorError: If interpreter can not be reached or if server
+            process exited or is still unreachable after timeout.
+        """
+        port = self.get_free_port()
+        command = self.validator.get_server_command(
+            self.HOST,
+            port,
+            interpreter_options=self.interpreter_options
+        )
+
+        self.log.debug("Starting validator server on port {}".format(port))
+
+        try:
+            self.process = subprocess.Popen(
+                command,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL
+            )
+        except FileNotFoundError as e:
+            msg = "Unable to reach interpreter to run validator: {}"
+            raise ValidatorError(msg.format(e))
+
+        self.endpoint = "http://{}:{}/".format(self.HOST, port)
+        self.session = self.get_session()
+
+        # Ensure server does not outlive current process
+        atexit.register(self.stop)
+
+        deadline = time.monotonic() + self.STARTUP_TIMEOUT
+        while not self.is_ready():
+            if self.process.poll() is not None:
+                msg = "Validator server exited with code {}"
+                returncode = self.process.returncode
+                self.stop()
+                raise ValidatorError(msg.format(returncode))
+            elif time.monotonic() > deadline:
+                msg = "Validator server is unreachable after {} seconds"
+                self.stop()
+                raise ValidatorError(msg.format(self.STARTUP_TIMEOUT))
+
+            time.sleep(self.STARTUP_INTERVAL)
+
+    def stop(self):
+        """
+        Stop server process if any.
+        """
+        if self.process is not None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+
+        if self.session is not None:
+            self.session.close()
+
+        atexit.unregister(self.stop)
+
+        self.process = None
+        self.endpoint = None
+        self.session = None
+
+    def request(self, path):
+        """
+        Request validation of a single path to server.
+
+        Url path is given to server so it fetch the document itself. Local file
+        content is sent to server without any charset, so server detects it
+        from document like validator tool does.
+
+        Arguments:
+            path (string): Page path to validate.
+
+        Raises:
+            ValidatorError: If request fails or server does not respond with a
+            valid report.
+
+        Returns:
+            list: List of message dictionnaries.
+        """
+        params = {"out": "json"}
+
+        try:
+            if is_url(path):
+                params["doc"] = path
+                response = self.session.get(
+                    self.endpoint,
+                    params=params,
+                    timeout=self.REQUEST_TIMEOUT,
+                )
+            else:
+                with io.open(path, "rb") as fp:
+                    content = fp.read()
+
+                response = self.session.post(
+                    self.endpoint,
+                    params=params,
+                    data=content,
+                    headers={"Content-Type": "text/html"},
+                    timeout=self.REQUEST_TIMEOUT,
+                )
+            response.raise_for_status()
+            payload = response.json()
+        except (OSError, RequestException, ValueError) as e:
+            msg = "Validator server request failed: {}"
+            raise ValidatorError(msg.format(e))
+
+        return payload.get("messages", [])
+
+    def validate(self, paths):
+        """
+        Request validation of every given paths to server.
+
+        Arguments:
+            paths (list): List of page path to validate.
+
+        Returns:
+            list: List of message dictionnaries from every paths. Each message
+            has an ``url`` item with the path it belongs to, local file paths
+            are resolved to absolute paths like the validator tool does.
+        """
+        messages = []
+
+        for path in paths:
+            url = path if is_url(path) else os.path.abspath(path)
+
+            for item in self.request(path):
+                item["url"] = url
+                messages.append(item)
+
+        return messages
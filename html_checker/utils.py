@@ -6,6 +6,10 @@ import html_checker
 from html_checker.exceptions import HtmlCheckerBaseException
 
 
+# Path prefixes which mark a path as an URL
+URL_PREFIXES = ("http://", "https://")
+
+
 def is_local_ressource(path):
     """
     Check if given path is a local ressource.
@@ -16,10 +20,7 @@ def is_local_ressource(path):
     Returns:
         bool: True if file path, else False.
     """
-    if not path.startswith("http://") and not path.startswith("https://"):
-        return True
-
-    return False
+    return not path.startswith(URL_PREFIXES)
 
 
 def is_url(path):
@@ -32,10 +33,7 @@ def is_url(path):
     Returns:
         bool: True if url path, else False.
     """
-    if path.startswith("http://") or path.startswith("https://"):
-        return True
-
-    return False
+    return path.startswith(URL_PREFIXES)
 
 
 def reduce_unique(items):
@@ -49,8 +47,7 @@ def reduce_unique(items):
     Returns:
         list: List of unique values.
     """
-    used = set()
-    return [x for x in items if x not in used and (used.add(x) or True)]
+    return list(dict.fromkeys(items))
 
 
 def execute_command(command):
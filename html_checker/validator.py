@@ -1,14 +1,38 @@
+import functools
+import hashlib
+import io
 import logging
 import os
+import stat
 import subprocess
-from collections import OrderedDict
-
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 import html_checker
+from html_checker.cache import ReportCache
 from html_checker.exceptions import (HtmlCheckerUnexpectedException,
                                      ValidatorError)
 from html_checker.reporter import ReportStore
-from html_checker.utils import is_local_ressource, get_application_path
+from html_checker.server import VnuServer
+from html_checker.utils import is_local_ressource, is_url, get_application_path
+
+
+# Application path does not change during process life so it is resolved once
+_HTML_CHECKER_ROOT = get_application_path()
+
+
+@functools.lru_cache(maxsize=None)
+def _resolve_validator_path(validator):
+    """
+    Resolve ``{HTML_CHECKER}`` pattern from validator tool path.
+
+    Arguments:
+        validator (string): Validator tool path.
+
+    Returns:
+        string: Resolved validator tool path.
+    """
+    return validator.format(HTML_CHECKER=_HTML_CHECKER_ROOT)
 
 
 class ValidatorInterface:
@@ -22,20 +46,71 @@ class ValidatorInterface:
         VALIDATOR (string): Path to validator tool to be executed by
             interpreter. It can contain leading ``{HTML_CHECKER}`` pattern to
             be replaced with absolute path to "py-html-checker" install.
+        SERVER_CLASS (string): Java class name to run validator as a web
+            service.
+        JAVA_PROPERTIES (dict): Java system properties to
+            define when interpreter is Java, unless they are already defined
+            from interpreter options.
+        FAST_STARTUP_OPTIONS (tuple): Java interpreter arguments to add when
+            fast startup is enabled. They trade peak performance for a faster
+            startup which is better for a short living validator process, so
+            they are never given to server.
+        CDS_ARCHIVE_OPTIONS (tuple): Java interpreter argument prefixes which
+            define a class data sharing archive.
         log (logging): Logging object set to application "py-html-checker".
+        server (html_checker.server.VnuServer): Running validator server if
+            any, validations are requested to it instead of executing a new
+            validator process.
+        cache (html_checker.cache.ReportCache): Cache of validator reports
+            for local file paths, ``None`` if cache is disabled.
 
-    Arguments:
+    Keyword Arguments:
         exception_class (object): An exception catch to class. Commonly it
             should be a child of
             ``html_checker.exceptions.HtmlCheckerBaseException``.
+        fast_startup (bool): Add ``FAST_STARTUP_OPTIONS`` to interpreter
+            options when interpreter is Java. Default to ``False``.
+        cds_archive (string): Path to a Java class data sharing archive to
+            use when interpreter is Java. If it does not exist yet when
+            instance is created, it will be created from the first validator
+            execution and used from the next instances. Default to ``None``
+            to not use any archive.
+        cache_dir (string): Directory path where to store validator reports
+            for local file paths, so unchanged files are not validated again
+            from the next runs. Default to ``None`` which disables cache.
     """
     REPORT_CLASS = ReportStore
     INTERPRETER = html_checker.DEFAULT_INTERPRETER
     VALIDATOR = html_checker.DEFAULT_VALIDATOR
-
-    def __init__(self, exception_class=None):
+    SERVER_CLASS = "nu.validator.servlet.Main"
+    JAVA_PROPERTIES = {
+        "file.encoding": "UTF-8",
+        "user.language": "en",
+    }
+    FAST_STARTUP_OPTIONS = (
+        "-XX:TieredStopAtLevel=1",
+        "-Xshare:auto",
+        "-XX:+UseSerialGC",
+    )
+    CDS_ARCHIVE_OPTIONS = (
+        "-XX:SharedArchiveFile=",
+        "-XX:ArchiveClassesAtExit=",
+    )
+
+    def __init__(self, exception_class=None, fast_startup=False,
+                 cds_archive=None, cache_dir=None):
         self.log = logging.getLogger("py-html-checker")
         self.catched_exception = self.get_catched_exception(exception_class)
+        self.fast_startup = fast_startup
+        self.cds_archive = cds_archive
+        # Archive is either used or created for the whole instance life, so
+        # every execution has the same options. Creation is pending until an
+        # execution has taken it
+        self.cds_use = bool(cds_archive) and os.path.exists(cds_archive)
+        self.cds_dump = bool(cds_archive) and not self.cds_use
+        self.cds_lock = threading.Lock()
+        self.server = None
+        self.cache = ReportCache(cache_dir) if cache_dir else None
 
     def get_catched_exception(self, exception_class=None):
         """
@@ -61,24 +136,29 @@ class ValidatorInterface:
         Compile options to a list.
 
         Arguments:
-            options (dict): A dict or a OrderedDict of options to
-                compile to a list of arguments. Option values can be either a
-                string or a list.
+            options (dict or iterable): A dict (insertion-ordered) of options
+                or an iterable of ``(name, value)`` pairs to compile to a list
+                of arguments. Option values can be either a string or a list.
 
         Returns:
             list: List of options arguments.
         """
         opts = []
+        append = opts.append
+        extend = opts.extend
+
+        if hasattr(options, "items"):
+            options = options.items()
 
-        for name, value in options.items():
+        for name, value in options:
             if name:
-                opts.append(name)
+                append(name)
 
             if value:
-                if isinstance(value, list) or isinstance(value, tuple):
-                    opts.extend(value)
+                if isinstance(value, (list, tuple)):
+                    extend(value)
                 else:
-                    opts.append(value)
+                    append(value)
 
         return opts
 
@@ -106,6 +186,17 @@ class ValidatorInterface:
 
         return args
 
+    def get_validator_path(self):
+        """
+        Return validator tool path with ``{HTML_CHECKER}`` pattern resolved.
+
+        Resolved paths are memoized and shared by every instance.
+
+        Returns:
+            string: Validator tool path.
+        """
+        return _resolve_validator_path(self.VALIDATOR)
+
     def get_validator_command(self, paths, interpreter_options=None,
                               tool_options=None):
         """
@@ -124,9 +215,7 @@ class ValidatorInterface:
         args = self.get_interpreter_part(options=interpreter_options)
 
         if self.VALIDATOR:
-            args.append(
-                self.VALIDATOR.format(HTML_CHECKER=get_application_path())
-            )
+            args.append(self.get_validator_path())
 
         if tool_options:
             args.extend(self.compile_options(tool_options))
@@ -135,29 +224,192 @@ class ValidatorInterface:
 
         return args
 
+    def get_server_command(self, host, port, interpreter_options=None):
+        """
+        Build full command line to run validator tool as a web service.
+
+        Arguments:
+            host (string): Address to bind server to.
+            port (integer): Port to bind server to.
+
+        Keyword Arguments:
+            interpreter_options (list): List of arguments to pass to interpreter.
+
+        Returns:
+            list: List of items to build full command line.
+        """
+        args = []
+
+        if self.INTERPRETER:
+            args.append(self.INTERPRETER)
+
+        if interpreter_options:
+            # Fast startup options would limit performances of a long living
+            # server
+            args.extend(self.compile_options([
+                (name, value)
+                for name, value in interpreter_options.items()
+                if name not in self.FAST_STARTUP_OPTIONS
+            ]))
+
+        args.extend([
+            "-Dnu.validator.servlet.bind-address={}".format(host),
+            "-cp",
+            self.get_validator_path(),
+            self.SERVER_CLASS,
+            str(port),
+        ])
+
+        return args
+
+    def start_server(self, interpreter_options=None):
+        """
+        Start a validator server which will be used for every validation
+        until it is stopped.
+
+        Tool options are not supported in server mode, only interpreter
+        options are used.
+
+        Keyword Arguments:
+            interpreter_options (dict): Dict of interpreter arguments to
+                include in server commandline. Default is ``None``.
+
+        Returns:
+            html_checker.server.VnuServer: Started server.
+        """
+        self.stop_server()
+
+        # Server is only kept once started so a failed start does not leave
+        # an unusable server
+        server = VnuServer(self, interpreter_options=interpreter_options)
+        server.start()
+        self.server = server
+
+        return self.server
+
+    def stop_server(self):
+        """
+        Stop validator server if any.
+        """
+        if self.server is not None:
+            self.server.stop()
+            self.server = None
+
     def execute_validator(self, command):
         """
         Execute validator process from given command.
 
+        Standard output and error output are captured separately so
+        interpreter messages on error output can not corrupt the report.
+
+        Standard output is entirely buffered and not parsed while it is read,
+        since a report from a failed execution must not be used and a report
+        may be stored in cache before being parsed.
+
         Arguments:
             command (list): List of command elements.
 
         Returns:
-            subprocess.CompletedProcess: Process output.
+            bytes: Process standard output.
         """
         # print()
         # print("🚑 exec:", command)
 
         try:
-            process = subprocess.check_output(command, stderr=subprocess.STDOUT)
+            process = subprocess.Popen(
+                command,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE
+            )
         except FileNotFoundError as e:
             msg = "Unable to reach interpreter to run validator: {}"
             raise ValidatorError(msg.format(e))
-        except subprocess.CalledProcessError as e:
+
+        output, errors = process.communicate()
+
+        if process.returncode != 0:
             msg = "Validator execution failed: {}"
-            raise ValidatorError(msg.format(e.output.decode("utf-8")))
+            raise ValidatorError(msg.format(errors.decode("utf-8")))
+
+        return output
+
+    def get_cds_options(self, dump=None):
+        """
+        Return Java interpreter options to use class data sharing archive.
+
+        If archive file exists it is used to load classes, else it will be
+        dumped when interpreter exits. Unrecognized options are ignored since
+        dynamic archive is not supported before Java 13 or from non HotSpot
+        interpreters.
+
+        Keyword Arguments:
+            dump (bool): Force options to dump archive if true or to use it
+                if false. Default to ``None`` to choose from archive file
+                existence.
+
+        Returns:
+            dict: Interpreter options.
+        """
+        if dump is None:
+            dump = not os.path.exists(self.cds_archive)
+
+        if dump:
+            option = "-XX:ArchiveClassesAtExit={}"
+        else:
+            option = "-XX:SharedArchiveFile={}"
+
+        return {
+            "-XX:+IgnoreUnrecognizedVMOptions": None,
+            option.format(self.cds_archive): None,
+        }
+
+    def use_cds(self, interpreter_options):
+        """
+        Check if class data sharing archive options have to be added to
+        given interpreter options.
+
+        Arguments:
+            interpreter_options (dict): Dict of interpreter arguments.
+
+        Returns:
+            bool: True if an archive is enabled, interpreter is Java and
+            options do not already define an archive.
+        """
+        if not self.cds_archive or self.INTERPRETER != "java":
+            return False
+
+        return not any([
+            name.startswith(self.CDS_ARCHIVE_OPTIONS)
+            for name in interpreter_options
+        ])
 
-        return process
+    def add_cds_dump_options(self, interpreter_options):
+        """
+        Add options to create class data sharing archive, only for the first
+        call so archive is created from a single execution even with
+        concurrent executions.
+
+        Arguments:
+            interpreter_options (dict): Dict of interpreter arguments, it is
+                not modified.
+
+        Returns:
+            dict: Given interpreter options with archive creation options if
+            this is the first call and archive have to be created, else given
+            interpreter options unchanged.
+        """
+        if not self.use_cds(interpreter_options):
+            return interpreter_options
+
+        with self.cds_lock:
+            if not self.cds_dump:
+                return interpreter_options
+            self.cds_dump = False
+
+        options = dict(interpreter_options)
+        options.update(self.get_cds_options(dump=True))
+
+        return options
 
     def manage_options(self, interpreter_options, tool_options):
         """
@@ -165,11 +417,14 @@ class ValidatorInterface:
 
         Arguments:
             interpreter_options (dict): Dict of interpreter arguments to
-                include in commandline. Default is ``None``.
+                include in commandline. Default is ``None`` but some Java
+                system properties are defined and fast startup and class data
+                sharing options are added if enabled.
             tool_options (dict): Dict of validator tool arguments to
                 include in commandline. Default is ``None`` but some options
                 are defined for internal purposes if not given, such as
-                ``--format``, ``--exist-zero-always`` and ``--user-agent``.
+                ``--format``, ``--exist-zero-always``, ``--stdout`` and
+                ``--user-agent``.
                 Except the last one, you should not try to change them or you
                 will probably break the validator and reporter.
 
@@ -177,9 +432,29 @@ class ValidatorInterface:
             tuple: Interpreter and validator option lists in a tuple.
         """
         if interpreter_options is None:
-            interpreter_options = OrderedDict([])
+            interpreter_options = {}
         if tool_options is None:
-            tool_options = OrderedDict([])
+            tool_options = {}
+
+        # Define Java system properties to avoid locale detection
+        if self.INTERPRETER == "java":
+            for name, value in self.JAVA_PROPERTIES.items():
+                prefix = "-D{}=".format(name)
+                if not any([k.startswith(prefix) for k in interpreter_options]):
+                    interpreter_options[prefix + value] = None
+
+        # Tune Java interpreter for a fast startup
+        if self.fast_startup and self.INTERPRETER == "java":
+            for name in self.FAST_STARTUP_OPTIONS:
+                if name not in interpreter_options:
+                    interpreter_options[name] = None
+
+        # Use class data sharing archive, it is created apart from a single
+        # execution
+        if self.cds_use and self.use_cds(interpreter_options):
+            for name, value in self.get_cds_options(dump=False).items():
+                if name not in interpreter_options:
+                    interpreter_options[name] = value
 
         # Enforce JSON format
         if "--format" not in tool_options:
@@ -190,6 +465,11 @@ class ValidatorInterface:
         if "--exit-zero-always" not in tool_options:
             tool_options["--exit-zero-always"] = None
 
+        # Enforce report to be written on stdout instead of stderr so it is
+        # not mixed with interpreter messages
+        if "--stdout" not in tool_options:
+            tool_options["--stdout"] = None
+
         # Define default user-agent
         if "--user-agent" not in tool_options:
             tool_options["--user-agent"] = html_checker.USER_AGENT
@@ -202,7 +482,26 @@ class ValidatorInterface:
 
         return interpreter_options, tool_options
 
-    def validate_item(self, paths, interpreter_options, tool_options):
+    def get_command_prefix(self, interpreter_options=None, tool_options=None):
+        """
+        Build command line part which is shared by every validator execution
+        with the same options, that is everything before paths.
+
+        Keyword Arguments:
+            interpreter_options (dict): Dict of interpreter arguments.
+            tool_options (dict): Dict of validator tool arguments.
+
+        Returns:
+            list: List of items to build command line prefix.
+        """
+        return self.get_validator_command(
+            [],
+            interpreter_options=interpreter_options,
+            tool_options=tool_options
+        )
+
+    def validate_item(self, paths, interpreter_options, tool_options,
+                      command_prefix=None):
         """
         Validate paths with validator tool.
 
@@ -211,18 +510,58 @@ class ValidatorInterface:
             interpreter_options (dict): Dict of interpreter arguments.
             tool_options (dict): Dict of validator tool arguments.
 
+        Keyword Arguments:
+            command_prefix (list): Command line prefix already built from
+                options. If not given, it is built from options.
+
         Returns:
-            subprocess.CompletedProcess: Process output.
+            bytes: Process standard output.
         """
         # Build command line from options
-        command = self.get_validator_command(
-            paths,
-            interpreter_options=interpreter_options,
-            tool_options=tool_options
-        )
+        if command_prefix is None:
+            command_prefix = self.get_command_prefix(
+                interpreter_options=interpreter_options,
+                tool_options=tool_options
+            )
 
         # Execute command process
-        return self.execute_validator(command)
+        return self.execute_validator(command_prefix + list(paths))
+
+    def get_cache_key(self, paths, command_prefix):
+        """
+        Build a cache key for a validation from its command line and the
+        content of every path.
+
+        Arguments:
+            paths (list): List of page path to validate.
+            command_prefix (list): Command line prefix built from options.
+
+        Returns:
+            string: Cache key or ``None`` if paths contains an url since its
+            content can not be known without requesting it, or a file which
+            can not be read.
+        """
+        digest = hashlib.sha256()
+
+        digest.update(
+            "\0".join([str(item) for item in command_prefix]).encode("utf-8")
+        )
+
+        for path in paths:
+            if is_url(path):
+                return None
+
+            try:
+                with io.open(path, "rb") as fp:
+                    content = fp.read()
+            except OSError:
+                return None
+
+            digest.update(b"\0")
+            digest.update(os.path.abspath(path).encode("utf-8"))
+            digest.update(hashlib.sha256(content).digest())
+
+        return digest.hexdigest()
 
     def check_local_filepath(self, path):
         """
@@ -233,27 +572,83 @@ class ValidatorInterface:
             paths (list): List of path to validate, only filepaths are checked.
         """
         if is_local_ressource(path):
-            if not os.path.exists(path):
+            # A single stat call answers both existence and kind
+            try:
+                mode = os.stat(path).st_mode
+            except (OSError, ValueError):
                 msg = "Given path does not exists: {}".format(path)
                 return msg
-            elif os.path.isdir(path):
+
+            if stat.S_ISDIR(mode):
                 msg = "Directory path are not supported: {}".format(path)
                 return msg
 
         return False
 
-    def validate(self, paths, interpreter_options=None, tool_options=None):
+    def get_report_content(self, paths, interpreter_options, tool_options):
+        """
+        Get validation report content for given paths, either from server,
+        cache or a validator execution.
+
+        Arguments:
+            paths (list): List of checkable page path to validate.
+            interpreter_options (dict): Dict of interpreter arguments.
+            tool_options (dict): Dict of validator tool arguments.
+
+        Returns:
+            tuple: Report content and a boolean which is true when content is
+            a JSON string to parse (``raw`` argument from
+            ``ReportStore.add``).
+        """
+        if self.server is not None:
+            return self.server.validate(paths), False
+
+        interpreter_options = self.add_cds_dump_options(interpreter_options)
+
+        # Compile options once for cache key and command line
+        command_prefix = self.get_command_prefix(
+            interpreter_options=interpreter_options,
+            tool_options=tool_options
+        )
+        cache_key = None
+        content = None
+
+        if self.cache is not None:
+            cache_key = self.get_cache_key(paths, command_prefix)
+            if cache_key:
+                content = self.cache.get(cache_key)
+
+        if content is None:
+            content = self.validate_item(
+                paths,
+                interpreter_options,
+                tool_options,
+                command_prefix=command_prefix
+            )
+            if cache_key:
+                self.cache.set(cache_key, content)
+
+        return content, True
+
+    def validate(self, paths, interpreter_options=None, tool_options=None,
+                 raise_failure=False):
         """
         Perform validation with validator tool for all given paths.
 
+        Report store initial registry is built in a thread while validation
+        is performed, since both mostly wait for system calls.
+
         Arguments:
             paths (list): List of page path to validate.
 
         Keyword Arguments:
-            interpreter_options (dict): Ordered dict of interpreter arguments to
+            interpreter_options (dict): Dict of interpreter arguments to
                 include in commandline. Default is ``None``.
-            tool_options (dict): Ordered dict of validator tool arguments to
+            tool_options (dict): Dict of validator tool arguments to
                 include in commandline. Default is ``None``.
+            raise_failure (bool): If enabled, a ``catched_exception`` from
+                validation is raised instead of being reported as an error for
+                every path. Default is ``False``.
 
         Returns:
             html_checker.reporter.ReportStore: Builded report store.
@@ -264,39 +659,62 @@ class ValidatorInterface:
             tool_options
         )
 
-        # Init a new ReportStore object
-        report = self.REPORT_CLASS(paths)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            # Init a new ReportStore object
+            report_future = executor.submit(self.REPORT_CLASS, paths)
+
+            # Check for local file path validity
+            valid_paths = []
+            path_errors = []
+            for item in paths:
+                error = self.check_local_filepath(item)
+                if error:
+                    path_errors.append({
+                        "url": item,
+                        "type": "error",
+                        "message": error,
+                    })
+                else:
+                    valid_paths.append(item)
+
+            content, raw = None, True
+            failure = None
+            if len(valid_paths) > 0:
+                try:
+                    content, raw = self.get_report_content(
+                        valid_paths,
+                        interpreter_options,
+                        tool_options
+                    )
+                except self.catched_exception as e:
+                    if raise_failure:
+                        raise
+                    failure = e
+
+            report = report_future.result()
+
+        if path_errors:
+            report.add(path_errors, raw=False)
+
+        # Purge erroneous paths from paths to validate
+        paths[:] = valid_paths
+
+        if content is not None:
+            try:
+                report.add(content, raw=raw)
+            except self.catched_exception as e:
+                if raise_failure:
+                    raise
+                failure = e
 
-        # Check for local file path validity
-        for item in paths[:]:
-            error = self.check_local_filepath(item)
-            if error:
+        if failure is not None:
+            for item in paths:
                 report.add([
                     {
                         "url": item,
                         "type": "error",
-                        "message": error,
+                        "message": failure,
                     },
                 ], raw=False)
-                # Purge erroneous path from paths to validate
-                paths.pop(paths.index(item))
-
-        if len(paths) > 0:
-            try:
-                content = self.validate_item(
-                    paths,
-                    interpreter_options,
-                    tool_options
-                )
-                report.add(content)
-            except self.catched_exception as e:
-                for item in paths:
-                    report.add([
-                        {
-                            "url": item,
-                            "type": "error",
-                            "message": e,
-                        },
-                    ], raw=False)
 
         return report
@@ -1,5 +1,4 @@
 import os
-from collections import OrderedDict
 
 import pytest
 
@@ -53,6 +52,23 @@ from html_checker.reporter import ReportStore
             ("{FIXTURES}/html/valid.basic.html", None),
         ],
     ),
+    # Many paths from the same directory
+    (
+        [
+            "tests/data_fixtures/html/valid.basic.html",
+            "{FIXTURES}/html/valid.warning.html",
+            "tests/data_fixtures/html/nope.html",
+            "tests/data_fixtures/nope/../html/valid.basic.html",
+            "tests/data_fixtures/html/valid.warning.html/",
+        ],
+        [
+            ("{FIXTURES}/html/valid.basic.html", None),
+            ("{FIXTURES}/html/valid.warning.html", None),
+            ("tests/data_fixtures/html/nope.html", None),
+            ("tests/data_fixtures/nope/../html/valid.basic.html", None),
+            ("tests/data_fixtures/html/valid.warning.html/", None),
+        ],
+    ),
 ])
 def test_initial_registry(settings, paths, expected):
     """
@@ -164,4 +180,5 @@ def test_add(paths, contents, expected):
     for content in contents:
         r.add(content)
 
-    assert OrderedDict(expected) == r.registry
+    # Compare items to check registry order too
+    assert expected == list(r.registry.items())
@@ -0,0 +1,45 @@
+import os
+
+from html_checker.cache import ReportCache, get_default_directory
+
+
+def test_get_default_directory(monkeypatch):
+    """
+    Default directory should follow XDG_CACHE_HOME if defined.
+    """
+    monkeypatch.setenv("XDG_CACHE_HOME", "/foo")
+    assert get_default_directory() == "/foo/py-html-checker"
+
+    monkeypatch.delenv("XDG_CACHE_HOME")
+    monkeypatch.setenv("HOME", "/bar")
+    assert get_default_directory() == "/bar/.cache/py-html-checker"
+
+
+def test_get_set(tmpdir):
+    """
+    Stored reports should be returned from their key, even from another
+    instance, and unknown keys return None.
+    """
+    directory = os.path.join(str(tmpdir), "cache")
+
+    cache = ReportCache(directory)
+    cache.set("foo", b"foo report")
+
+    assert cache.get("foo") == b"foo report"
+    assert cache.get("bar") is None
+    assert ReportCache(directory).get("foo") == b"foo report"
+    assert os.listdir(directory) == ["foo.json"]
+
+
+def test_set_unwritable(tmpdir):
+    """
+    A report which can not be written should not raise any error.
+    """
+    # A file in place of directory makes directory creation fail
+    directory = tmpdir.join("cache")
+    directory.write("")
+
+    cache = ReportCache(str(directory))
+    cache.set("foo", b"foo report")
+
+    assert cache.get("foo") is None
@@ -1,4 +1,5 @@
 import os
+import socket
 from collections import OrderedDict
 
 import pytest
@@ -10,16 +11,23 @@ from html_checker.exceptions import ValidatorError
 
 @pytest.mark.parametrize("options,expected", [
     (
-        {
-            "--foo": "bar",
-        },
+        (("--foo", "bar"),),
         ["--foo", "bar"],
     ),
+    (
+        (("-f", None),),
+        ["-f"],
+    ),
+    (
+        (("--foo", ["bar", "ping"]),),
+        ["--foo", "bar", "ping"],
+    ),
     (
         {
-            "-f": None
+            "--foo": "bar",
+            "-f": None,
         },
-        ["-f"],
+        ["--foo", "bar", "-f"],
     ),
     (
         OrderedDict([
@@ -36,13 +44,12 @@ from html_checker.exceptions import ValidatorError
         ],
     ),
 ])
-def test_compile_options(options, expected):
+def test_compile_options(shared_validator, options, expected):
     """
-    Should flatten to a list any kind of options
+    Should flatten to a list any kind of options, either a dict or pairs of
+    name and value.
     """
-    v = ValidatorInterface()
-
-    assert expected == v.compile_options(options)
+    assert expected == shared_validator.compile_options(options)
 
 
 @pytest.mark.parametrize("interpreter,options,expected", [
@@ -144,6 +151,52 @@ def test_get_validator_command(settings, interpreter, validator,
     assert expected == cmd
 
 
+@pytest.mark.parametrize("interpreter,validator,interpreter_options,tool_options", [
+    (None, None, {}, {}),
+    (None, "", {}, {}),
+    ("dummycli", "validate", {"-v": "3"}, {"--foo": "bar"}),
+    (None, None, {"-Xss512k": None}, {"--filterpattern": ["foo", "bar"]}),
+])
+def test_get_command_prefix(interpreter, validator, interpreter_options,
+                            tool_options):
+    """
+    Command prefix should be the same than a command line without paths.
+    """
+    v = ValidatorInterface()
+
+    if interpreter is not None:
+        v.INTERPRETER = interpreter
+
+    if validator is not None:
+        v.VALIDATOR = validator
+
+    expected = v.get_validator_command(
+        [],
+        interpreter_options=interpreter_options,
+        tool_options=tool_options
+    )
+
+    prefix = v.get_command_prefix(
+        interpreter_options=interpreter_options,
+        tool_options=tool_options
+    )
+
+    assert expected == prefix
+
+
+def test_get_command_prefix_override():
+    """
+    Command prefix should be built from possibly overridden command methods.
+    """
+    class DummyValidator(ValidatorInterface):
+        def get_validator_path(self):
+            return "dummytool"
+
+    v = DummyValidator()
+
+    assert v.get_command_prefix() == ["java", "-jar", "dummytool"]
+
+
 @pytest.mark.parametrize("interpreter,validator,interpreter_options,tool_options,paths,expected", [
     # Unreachable interpreter
     (
@@ -250,4 +303,265 @@ def test_validate_success(caplog, settings, paths, expected):
 
     report = v.validate(paths)
 
-    assert OrderedDict(final_expection) == report.registry
+    assert final_expection == list(report.registry.items())
+
+
+@pytest.mark.parametrize("interpreter,interpreter_options,expected", [
+    (
+        None,
+        {},
+        ["java", "-Dnu.validator.servlet.bind-address=127.0.0.1", "-cp",
+         "{APPLICATION}/vnujar/vnu.jar", "nu.validator.servlet.Main", "8888"],
+    ),
+    (
+        None,
+        {"-Xss512k": None},
+        ["java", "-Xss512k", "-Dnu.validator.servlet.bind-address=127.0.0.1",
+         "-cp", "{APPLICATION}/vnujar/vnu.jar", "nu.validator.servlet.Main",
+         "8888"],
+    ),
+    # Fast startup options are not given to server
+    (
+        None,
+        {"-XX:TieredStopAtLevel=1": None, "-Xss512k": None,
+         "-XX:+UseSerialGC": None},
+        ["java", "-Xss512k", "-Dnu.validator.servlet.bind-address=127.0.0.1",
+         "-cp", "{APPLICATION}/vnujar/vnu.jar", "nu.validator.servlet.Main",
+         "8888"],
+    ),
+])
+def test_get_server_command(settings, interpreter, interpreter_options,
+                            expected):
+    """
+    Should return full command line to run validator tool as a web service.
+    """
+    v = ValidatorInterface()
+
+    if interpreter is not None:
+        v.INTERPRETER = interpreter
+
+    expected = [settings.format(item) for item in expected]
+
+    cmd = v.get_server_command(
+        "127.0.0.1",
+        8888,
+        interpreter_options=interpreter_options
+    )
+
+    assert expected == cmd
+
+
+def test_get_cache_key(settings, shared_validator):
+    """
+    Cache key should depend from command line and path contents but it can
+    not be built for urls.
+    """
+    v = shared_validator
+
+    basic = settings.format("{FIXTURES}/html/valid.basic.html")
+    warning = settings.format("{FIXTURES}/html/valid.warning.html")
+
+    key = v.get_cache_key([basic], ["java", "--format", "json"])
+
+    assert key == v.get_cache_key([basic], ["java", "--format", "json"])
+    assert key != v.get_cache_key([warning], ["java", "--format", "json"])
+    assert key != v.get_cache_key([basic], ["java", "--format", "text"])
+    assert v.get_cache_key([basic, "http://perdu.com"], ["java"]) is None
+
+
+def test_get_cache_key_unreadable(tmpdir):
+    """
+    Cache key should not be built for a file which can not be read.
+    """
+    v = ValidatorInterface()
+
+    path = str(tmpdir.join("page.sock"))
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.bind(path)
+
+        assert v.check_local_filepath(path) is False
+        assert v.get_cache_key([path], ["java"]) is None
+
+
+@pytest.mark.parametrize("use_cache,expected", [
+    (False, 2),
+    (True, 1),
+])
+def test_validate_cache(monkeypatch, tmpdir, settings, use_cache, expected):
+    """
+    Validator should be executed only once for the same local path content
+    when cache is enabled.
+    """
+    executed = []
+
+    def mock_execute_validator(*args, **kwargs):
+        executed.append(args[1])
+        return b"""{"messages":[]}"""
+
+    monkeypatch.setattr(ValidatorInterface, "execute_validator",
+                        mock_execute_validator)
+
+    v = ValidatorInterface(cache_dir=str(tmpdir) if use_cache else None)
+
+    path = settings.format("{FIXTURES}/html/valid.basic.html")
+
+    first = v.validate([path])
+    second = v.validate([path])
+
+    assert len(executed) == expected
+    assert first.registry == second.registry == OrderedDict([(path, None)])
+
+
+def test_get_validator_path(settings):
+    """
+    Resolved validator path should follow changes on 'VALIDATOR' attribute.
+    """
+    v = ValidatorInterface()
+
+    assert v.get_validator_path() == settings.format(
+        "{APPLICATION}/vnujar/vnu.jar"
+    )
+
+    v.VALIDATOR = "{HTML_CHECKER}/dummytool"
+
+    assert v.get_validator_path() == settings.format(
+        "{APPLICATION}/dummytool"
+    )
+
+
+def test_get_cds_options(tmpdir):
+    """
+    Archive should be dumped if it does not exist yet, else it should be used.
+    """
+    archive = str(tmpdir.join("vnu.jsa"))
+
+    v = ValidatorInterface(cds_archive=archive)
+
+    assert v.get_cds_options() == OrderedDict([
+        ("-XX:+IgnoreUnrecognizedVMOptions", None),
+        ("-XX:ArchiveClassesAtExit={}".format(archive), None),
+    ])
+
+    tmpdir.join("vnu.jsa").write("")
+
+    assert v.get_cds_options() == OrderedDict([
+        ("-XX:+IgnoreUnrecognizedVMOptions", None),
+        ("-XX:SharedArchiveFile={}".format(archive), None),
+    ])
+
+
+def test_manage_options_cds_dump(tmpdir):
+    """
+    Archive created after instance init should not change options and it
+    should be dumped from a single execution.
+    """
+    archive = str(tmpdir.join("vnu.jsa"))
+    dump_options = {
+        "-XX:+IgnoreUnrecognizedVMOptions": None,
+        "-XX:ArchiveClassesAtExit={}".format(archive): None,
+    }
+
+    v = ValidatorInterface(cds_archive=archive)
+
+    interpreter_options, tool_options = v.manage_options(None, None)
+    expected = dict(interpreter_options)
+
+    tmpdir.join("vnu.jsa").write("")
+
+    interpreter_options, tool_options = v.manage_options(
+        interpreter_options,
+        tool_options
+    )
+
+    assert interpreter_options == expected
+    assert not any([
+        name.startswith(v.CDS_ARCHIVE_OPTIONS) for name in interpreter_options
+    ])
+
+    first = v.add_cds_dump_options(interpreter_options)
+    second = v.add_cds_dump_options(interpreter_options)
+
+    assert first == dict(interpreter_options, **dump_options)
+    assert second == interpreter_options == expected
+
+    # Next validations should not use archive which may still be dumped
+    interpreter_options, tool_options = v.manage_options(
+        interpreter_options,
+        tool_options
+    )
+
+    assert interpreter_options == expected
+
+
+def test_manage_options_cds_use(tmpdir):
+    """
+    Existing archive should be used from every execution and options should
+    not change when archive is removed.
+    """
+    archive = str(tmpdir.join("vnu.jsa"))
+    tmpdir.join("vnu.jsa").write("")
+
+    v = ValidatorInterface(cds_archive=archive)
+
+    interpreter_options, tool_options = v.manage_options(None, None)
+    expected = dict(interpreter_options)
+
+    tmpdir.join("vnu.jsa").remove()
+
+    interpreter_options, tool_options = v.manage_options(
+        interpreter_options,
+        tool_options
+    )
+
+    assert interpreter_options == expected
+    assert [
+        name for name in interpreter_options
+        if name.startswith(v.CDS_ARCHIVE_OPTIONS)
+    ] == ["-XX:SharedArchiveFile={}".format(archive)]
+    assert v.add_cds_dump_options(interpreter_options) == expected
+
+
+def test_manage_options_cds_given(tmpdir):
+    """
+    Archive options should not be added when an archive is already defined
+    from interpreter options.
+    """
+    archive = str(tmpdir.join("vnu.jsa"))
+
+    v = ValidatorInterface(cds_archive=archive)
+
+    interpreter_options, tool_options = v.manage_options(
+        {"-XX:SharedArchiveFile=/foo/bar.jsa": None},
+        None
+    )
+
+    assert [
+        name for name in interpreter_options
+        if name.startswith(v.CDS_ARCHIVE_OPTIONS)
+    ] == ["-XX:SharedArchiveFile=/foo/bar.jsa"]
+    assert v.add_cds_dump_options(interpreter_options) == interpreter_options
+
+
+@pytest.mark.parametrize("interpreter_options,expected", [
+    (
+        None,
+        ["-Dfile.encoding=UTF-8", "-Duser.language=en"],
+    ),
+    (
+        OrderedDict([("-Dfile.encoding=latin1", None)]),
+        ["-Dfile.encoding=latin1", "-Duser.language=en"],
+    ),
+])
+def test_manage_options_properties(interpreter_options, expected):
+    """
+    Java system properties should be defined unless already given.
+    """
+    v = ValidatorInterface(fast_startup=False)
+
+    interpreter_options, tool_options = v.manage_options(
+        interpreter_options,
+        None
+    )
+
+    assert expected == list(interpreter_options.keys())
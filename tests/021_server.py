@@ -0,0 +1,112 @@
+import pytest
+
+from html_checker import USER_AGENT
+from html_checker.exceptions import ValidatorError
+from html_checker.server import VnuServer
+from html_checker.validator import ValidatorInterface
+
+
+def test_start_fail():
+    """
+    Server should raise an exception when interpreter is unreachable.
+    """
+    v = ValidatorInterface()
+    v.INTERPRETER = "nietniet"
+
+    server = VnuServer(v)
+
+    with pytest.raises(ValidatorError) as excinfo:
+        server.start()
+
+    assert str(excinfo.value) == (
+        "Unable to reach interpreter to run validator: [Errno 2] No such "
+        "file or directory: 'nietniet'"
+    )
+    assert server.process is None
+
+
+def test_validate(monkeypatch, settings):
+    """
+    Messages from every requested path should be merged with their path
+    url, local paths are resolved to absolute paths.
+    """
+    def mock_request(*args, **kwargs):
+        path = args[1]
+        return [{"type": "info", "message": "Checked {}".format(path)}]
+
+    monkeypatch.setattr(VnuServer, "request", mock_request)
+
+    server = VnuServer(ValidatorInterface())
+
+    messages = server.validate([
+        "http://perdu.com",
+        "tests/data_fixtures/html/valid.basic.html",
+    ])
+
+    assert messages == [
+        {
+            "url": "http://perdu.com",
+            "type": "info",
+            "message": "Checked http://perdu.com",
+        },
+        {
+            "url": settings.format("{FIXTURES}/html/valid.basic.html"),
+            "type": "info",
+            "message": "Checked tests/data_fixtures/html/valid.basic.html",
+        },
+    ]
+
+
+def test_get_session(shared_validator):
+    """
+    Server session should keep enough connections alive for concurrent
+    requests and identify itself with tool user agent.
+    """
+    server = VnuServer(shared_validator)
+    session = server.get_session()
+
+    adapter = session.get_adapter("http://127.0.0.1:8888/")
+
+    assert session.headers["User-Agent"] == USER_AGENT
+    assert adapter._pool_maxsize == VnuServer.POOL_SIZE
+
+    session.close()
+
+
+def test_request_local_file(settings):
+    """
+    Local file content should be posted without charset and with a timeout.
+    """
+    class DummyResponse:
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return {"messages": [{"type": "info"}]}
+
+    class DummySession:
+        def post(self, *args, **kwargs):
+            self.kwargs = kwargs
+            return DummyResponse()
+
+    server = VnuServer(ValidatorInterface())
+    server.endpoint = "http://127.0.0.1:8888/"
+    server.session = DummySession()
+
+    path = settings.format("{FIXTURES}/html/valid.basic.html")
+
+    assert server.request(path) == [{"type": "info"}]
+    assert server.session.kwargs["headers"] == {"Content-Type": "text/html"}
+    assert server.session.kwargs["timeout"] == VnuServer.REQUEST_TIMEOUT
+
+
+def test_request_unreadable_file(settings):
+    """
+    Unreadable local file should raise a validator error.
+    """
+    server = VnuServer(ValidatorInterface())
+
+    with pytest.raises(ValidatorError) as excinfo:
+        server.request(settings.format("{FIXTURES}/html"))
+
+    assert str(excinfo.value).startswith("Validator server request failed: ")
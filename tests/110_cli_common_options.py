@@ -5,12 +5,15 @@ processing or executing anything else.
 """
 import logging
 import os
+from collections import OrderedDict
 
 import pytest
 
 from click.testing import CliRunner
 
+from html_checker.cli.common import validate_routines
 from html_checker.cli.entrypoint import cli_frontend
+from html_checker.exceptions import HtmlCheckerBaseException, ValidatorError
 from html_checker.export import LoggingExport
 from html_checker.validator import ValidatorInterface
 from html_checker.sitemap import Sitemap
@@ -22,16 +25,16 @@ class DummyReport:
     given paths in registry
     """
     def __init__(self, *args, **kwargs):
-        self.registry = []
+        self.registry = OrderedDict()
 
-    def add(self, content):
+    def add(self, content, raw=True):
         print()
         print("DummyReport: content")
         print(content)
         print()
         print("DummyReport: registry before")
         print(self.registry)
-        self.registry.append(content)
+        self.registry[tuple(content)] = None
         print()
         print("DummyReport: registry after")
         print(self.registry)
@@ -86,9 +89,11 @@ def test_interpreter_xss(monkeypatch, caplog, settings, command_name):
     commandline = (
         "java"
         " -Xss512k"
+        " -Dfile.encoding=UTF-8 -Duser.language=en"
         " -jar {APPLICATION}/vnujar/vnu.jar"
         " --format json"
         " --exit-zero-always"
+        " --stdout"
         " --user-agent {USER_AGENT}"
         " http://perdu.com"
     )
@@ -133,6 +138,63 @@ def test_interpreter_xss(monkeypatch, caplog, settings, command_name):
         assert expected == caplog.record_tuples
 
 
+@pytest.mark.parametrize("command_name,option,expected", [
+    (
+        "page",
+        "--fast-startup",
+        " -XX:TieredStopAtLevel=1 -Xshare:auto -XX:+UseSerialGC",
+    ),
+    (
+        "site",
+        "--fast-startup",
+        " -XX:TieredStopAtLevel=1 -Xshare:auto -XX:+UseSerialGC",
+    ),
+    (
+        "page",
+        "--no-fast-startup",
+        "",
+    ),
+    (
+        "site",
+        "--no-fast-startup",
+        "",
+    ),
+])
+def test_interpreter_fast_startup(monkeypatch, caplog, settings, command_name,
+                                  option, expected):
+    """
+    Fast startup options should be added to interpreter part unless disabled.
+    """
+    monkeypatch.setattr(ValidatorInterface, "execute_validator",
+                        mock_validator_execute_validator)
+    monkeypatch.setattr(ValidatorInterface, "REPORT_CLASS", DummyReport)
+    monkeypatch.setattr(LoggingExport, "build", mock_export_logging_build)
+    monkeypatch.setattr(Sitemap, "get_urls", mock_sitemap_get_urls)
+
+    commandline = (
+        "java"
+        " -Dfile.encoding=UTF-8 -Duser.language=en"
+        "{}"
+        " -jar {{APPLICATION}}/vnujar/vnu.jar"
+        " --format json"
+        " --exit-zero-always"
+        " --stdout"
+        " --user-agent {{USER_AGENT}}"
+        " http://perdu.com"
+    ).format(expected)
+
+    runner = CliRunner()
+    with runner.isolated_filesystem():
+        result = runner.invoke(cli_frontend, [
+            command_name, option, "http://perdu.com"
+        ])
+
+        assert result.exit_code == 0
+        assert caplog.record_tuples[-1] == (
+            "py-html-checker", logging.INFO, settings.format(commandline)
+        )
+
+
 @pytest.mark.parametrize("command_name", [
     "page",
     "site",
@@ -149,10 +211,12 @@ def test_interpreter_nostream(monkeypatch, caplog, settings, command_name):
 
     commandline = (
         "java"
+        " -Dfile.encoding=UTF-8 -Duser.language=en"
         " -jar {APPLICATION}/vnujar/vnu.jar"
         " --no-stream"
         " --format json"
         " --exit-zero-always"
+        " --stdout"
         " --user-agent {USER_AGENT}"
         " http://perdu.com"
     )
@@ -183,6 +247,44 @@ def test_interpreter_nostream(monkeypatch, caplog, settings, command_name):
         assert expected == caplog.record_tuples
 
 
+@pytest.mark.parametrize("command_name", [
+    "page",
+    "site",
+])
+def test_no_langdetect(monkeypatch, caplog, settings, command_name):
+    """
+    '--no-langdetect' option should be correctly added to validator part.
+    """
+    monkeypatch.setattr(ValidatorInterface, "execute_validator",
+                        mock_validator_execute_validator)
+    monkeypatch.setattr(ValidatorInterface, "REPORT_CLASS", DummyReport)
+    monkeypatch.setattr(LoggingExport, "build", mock_export_logging_build)
+    monkeypatch.setattr(Sitemap, "get_urls", mock_sitemap_get_urls)
+
+    commandline = (
+        "java"
+        " -Dfile.encoding=UTF-8 -Duser.language=en"
+        " -jar {APPLICATION}/vnujar/vnu.jar"
+        " --no-langdetect"
+        " --format json"
+        " --exit-zero-always"
+        " --stdout"
+        " --user-agent {USER_AGENT}"
+        " http://perdu.com"
+    )
+
+    runner = CliRunner()
+    with runner.isolated_filesystem():
+        result = runner.invoke(cli_frontend, [
+            command_name, "--no-langdetect", "http://perdu.com"
+        ])
+
+        assert result.exit_code == 0
+        assert caplog.record_tuples[-1] == (
+            "py-html-checker", logging.INFO, settings.format(commandline)
+        )
+
+
 @pytest.mark.parametrize("command_name", [
     "page",
     "site",
@@ -199,10 +301,12 @@ def test_user_agent(monkeypatch, caplog, settings, command_name):
 
     commandline = (
         "java"
+        " -Dfile.encoding=UTF-8 -Duser.language=en"
         " -jar {APPLICATION}/vnujar/vnu.jar"
         " --user-agent Foobar"
         " --format json"
         " --exit-zero-always"
+        " --stdout"
         " http://perdu.com"
     )
 
@@ -232,20 +336,48 @@ def test_user_agent(monkeypatch, caplog, settings, command_name):
         assert expected == caplog.record_tuples
 
 
-@pytest.mark.parametrize("split,paths", [
+@pytest.mark.parametrize("split,jobs,paths,batches", [
     (
         False,
+        None,
         ["http://foo.com", "http://bar.com"],
+        [["http://foo.com", "http://bar.com"]],
     ),
     (
         True,
+        None,
         ["http://foo.com", "http://bar.com"],
+        [["http://foo.com", "http://bar.com"]],
+    ),
+    (
+        True,
+        "3",
+        ["http://foo.com", "http://bar.com", "http://ping.com",
+         "http://pong.com"],
+        [["http://foo.com", "http://bar.com"], ["http://ping.com"],
+         ["http://pong.com"]],
+    ),
+    (
+        True,
+        "5",
+        ["http://foo.com", "http://bar.com", "http://ping.com"],
+        [["http://foo.com"], ["http://bar.com"], ["http://ping.com"]],
+    ),
+    (
+        True,
+        "2",
+        ["http://foo.com", "http://bar.com", "http://ping.com"],
+        [["http://foo.com", "http://bar.com"], ["http://ping.com"]],
     ),
 ])
-def test_page_split(monkeypatch, caplog, settings, split, paths):
+def test_page_split(monkeypatch, caplog, settings, split, jobs, paths,
+                    batches):
     """
-    '--split' option should cause executing a new nvu validator instance on
-    each path and only one for all path when not enabled.
+    '--split' option should cause batching paths over as many vnu validator
+    instances as '--jobs' value and only one for all path when not enabled.
+
+    Instances are executed concurrently but reports are still built in the
+    same order than paths.
     """
     monkeypatch.setattr(ValidatorInterface, "execute_validator",
                         mock_validator_execute_validator)
@@ -254,9 +386,11 @@ def test_page_split(monkeypatch, caplog, settings, split, paths):
 
     commandline = settings.format((
         "java"
+        " -Dfile.encoding=UTF-8 -Duser.language=en"
         " -jar {APPLICATION}/vnujar/vnu.jar"
         " --format json"
         " --exit-zero-always"
+        " --stdout"
         " --user-agent {USER_AGENT}"
         " "
     ))
@@ -267,17 +401,10 @@ def test_page_split(monkeypatch, caplog, settings, split, paths):
         ("py-html-checker", logging.INFO, initial_msg.format(len(paths))),
     ]
 
-    # In split mode, there should one command line for each path
-    if split:
-        for p in paths:
-            log = ("py-html-checker", logging.INFO, commandline + p)
-            expected.append(
-                log
-            ),
-    # Else there should be only one command line for all paths
-    else:
+    # There should be one command line for each batch of paths
+    for batch in batches:
         expected.append(
-            ("py-html-checker", logging.INFO, commandline + " ".join(paths))
+            ("py-html-checker", logging.INFO, commandline + " ".join(batch))
         ),
 
     runner = CliRunner()
@@ -287,6 +414,8 @@ def test_page_split(monkeypatch, caplog, settings, split, paths):
         args = ["page"]
         if split:
             args.append("--split")
+        if jobs:
+            args.extend(["--jobs", jobs])
         for item in paths:
             args.append(item)
 
@@ -308,20 +437,27 @@ def test_page_split(monkeypatch, caplog, settings, split, paths):
         assert expected == caplog.record_tuples
 
 
-@pytest.mark.parametrize("split,paths", [
+@pytest.mark.parametrize("split,jobs,batches", [
     (
         False,
-        ["http://foo.com", "http://bar.com"],
+        None,
+        [["http://foo.com", "http://bar.com"]],
     ),
     (
         True,
-        ["http://foo.com", "http://bar.com"],
+        None,
+        [["http://foo.com", "http://bar.com"]],
+    ),
+    (
+        True,
+        "2",
+        [["http://foo.com"], ["http://bar.com"]],
     ),
 ])
-def test_site_split(monkeypatch, caplog, settings, split, paths):
+def test_site_split(monkeypatch, caplog, settings, split, jobs, batches):
     """
-    '--split' option should cause executing a new vnu validator instance on
-    each path and only one for all path when not enabled.
+    '--split' option should cause batching paths over as many vnu validator
+    instances as '--jobs' value and only one for all path when not enabled.
     """
     def mock_sitemap_get_urls(*args, **kwargs):
         """
@@ -338,9 +474,11 @@ def test_site_split(monkeypatch, caplog, settings, split, paths):
 
     commandline = settings.format((
         "java"
+        " -Dfile.encoding=UTF-8 -Duser.language=en"
         " -jar {APPLICATION}/vnujar/vnu.jar"
         " --format json"
         " --exit-zero-always"
+        " --stdout"
         " --user-agent {USER_AGENT}"
         " "
     ))
@@ -348,20 +486,13 @@ def test_site_split(monkeypatch, caplog, settings, split, paths):
     # Build expected logs
     initial_msg = "Sitemap have {} paths"
     expected = [
-        ("py-html-checker", logging.INFO, initial_msg.format(len(paths))),
+        ("py-html-checker", logging.INFO, initial_msg.format(2)),
     ]
 
-    # In split mode, there should one command line for each path
-    if split:
-        for p in paths:
-            log = ("py-html-checker", logging.INFO, commandline + p)
-            expected.append(
-                log
-            ),
-    # Else there should be only one command line for all paths
-    else:
+    # There should be one command line for each batch of paths
+    for batch in batches:
         expected.append(
-            ("py-html-checker", logging.INFO, commandline + " ".join(paths))
+            ("py-html-checker", logging.INFO, commandline + " ".join(batch))
         ),
 
     runner = CliRunner()
@@ -371,6 +502,8 @@ def test_site_split(monkeypatch, caplog, settings, split, paths):
         args = ["site"]
         if split:
             args.append("--split")
+        if jobs:
+            args.extend(["--jobs", jobs])
         args.append("http://perdu.com/sitemap.xml")
 
         result = runner.invoke(cli_frontend, args, catch_exceptions=False)
@@ -389,3 +522,114 @@ def test_site_split(monkeypatch, caplog, settings, split, paths):
 
         assert result.exit_code == 0
         assert expected == caplog.record_tuples
+
+
+@pytest.mark.parametrize("split,expected", [
+    (
+        False,
+        [
+            OrderedDict([("foo.html", None), ("bar.html", None)]),
+            OrderedDict([("ping.html", None)]),
+        ],
+    ),
+    (
+        True,
+        [
+            {"foo.html": None},
+            {"bar.html": None},
+            {"ping.html": None},
+        ],
+    ),
+])
+def test_validate_routines(monkeypatch, split, expected):
+    """
+    Every routine registry should be yielded in routine order and divided for
+    each path in split mode.
+    """
+    def mock_validator_validate(*args, **kwargs):
+        report = DummyReport()
+        report.registry = OrderedDict([(item, None) for item in args[1]])
+        return report
+
+    monkeypatch.setattr(ValidatorInterface, "validate",
+                        mock_validator_validate)
+
+    routines = [["foo.html", "bar.html"], ["ping.html"]]
+
+    registries = validate_routines(ValidatorInterface(), routines, None, None,
+                                   jobs=2, split=split)
+
+    assert list(registries) == expected
+
+
+def test_validate_routines_split_failure(monkeypatch, caplog):
+    """
+    In split mode, a failed routine should be validated again path by path so
+    failure only concerns the offending path.
+    """
+    def mock_validator_execute_validator(*args, **kwargs):
+        command = args[1]
+        if "http://bad.com" in command:
+            raise ValidatorError("Validator execution failed: Stack overflow")
+        return b"""{"messages":[]}"""
+
+    monkeypatch.setattr(ValidatorInterface, "execute_validator",
+                        mock_validator_execute_validator)
+
+    validator = ValidatorInterface(exception_class=HtmlCheckerBaseException)
+    routines = [["http://foo.com", "http://bad.com", "http://bar.com"]]
+
+    registries = list(validate_routines(validator, routines, None, None,
+                                        split=True))
+
+    assert [list(item.keys()) for item in registries] == [
+        ["http://foo.com"],
+        ["http://bad.com"],
+        ["http://bar.com"],
+    ]
+    assert registries[0]["http://foo.com"] is None
+    assert registries[2]["http://bar.com"] is None
+
+    errors = registries[1]["http://bad.com"]
+    assert len(errors) == 1
+    assert errors[0]["type"] == "error"
+    assert str(errors[0]["message"]) == (
+        "Validator execution failed: Stack overflow"
+    )
+
+    assert caplog.record_tuples == [
+        (
+            "py-html-checker",
+            logging.WARNING,
+            "Validation failed for a batch of 3 paths, validating them one "
+            "by one",
+        ),
+    ]
+
+
+def test_validate_routines_server_tool_options(monkeypatch, caplog):
+    """
+    Validator tool options should be reported as ignored with server.
+    """
+    def mock_validator_start_server(*args, **kwargs):
+        raise ValidatorError("Validator server failed to start")
+
+    monkeypatch.setattr(ValidatorInterface, "start_server",
+                        mock_validator_start_server)
+
+    validator = ValidatorInterface(exception_class=HtmlCheckerBaseException)
+    tool_options = {"--no-langdetect": None, "--no-stream": None}
+
+    registries = list(validate_routines(validator, [["http://foo.com"]], None,
+                                        tool_options, server=True))
+
+    assert len(registries) == 1
+    assert registries[0]["all"][0]["type"] == "critical"
+    assert caplog.record_tuples == [
+        (
+            "py-html-checker",
+            logging.WARNING,
+            "Validator options are not supported with server, ignored: "
+            "--no-langdetect, --no-stream",
+        ),
+    ]
@@ -263,3 +263,33 @@ def test_page_json_destination(monkeypatch, caplog, settings):
         assert result.exit_code == 0
 
         assert expected == caplog.record_tuples
+
+
+def test_page_safe_server_unreachable(monkeypatch, caplog):
+    """
+    With safe mode enabled, a server which can not be started should be
+    reported instead of raising an exception.
+    """
+    monkeypatch.setattr(ValidatorInterface, "INTERPRETER", "nietniet")
+
+    runner = CliRunner()
+    with runner.isolated_filesystem():
+        result = runner.invoke(cli_frontend, [
+            "page", "--safe", "--server", "http://perdu.com"
+        ])
+
+        assert result.exit_code == 0
+        assert caplog.record_tuples == [
+            (
+                "py-html-checker",
+                logging.INFO,
+                "Launching validation for 1 paths",
+            ),
+            ("py-html-checker", logging.INFO, "all"),
+            (
+                "py-html-checker",
+                logging.ERROR,
+                "Unable to reach interpreter to run validator: [Errno 2] No "
+                "such file or directory: 'nietniet'",
+            ),
+        ]
@@ -5,6 +5,7 @@ import os
 import pytest
 
 import html_checker
+from html_checker.validator import ValidatorInterface
 
 
 class FixturesSettingsTestMixin(object):
@@ -28,21 +29,23 @@ class FixturesSettingsTestMixin(object):
             self.tests_path,
             self.fixtures_dir
         )
+        # Variables available from format method
+        self.variables = {
+            "HOMEDIR": os.path.expanduser("~"),
+            "PACKAGE": self.package_path,
+            "APPLICATION": self.application_path,
+            "TESTS": self.tests_path,
+            "FIXTURES": self.fixtures_path,
+            "VERSION": html_checker.__version__,
+            "USER_AGENT": html_checker.USER_AGENT,
+        }
 
     def format(self, path):
         """
         Format given string to include various variables related to this
         application, mostly paths.
         """
-        return path.format(
-            HOMEDIR=os.path.expanduser("~"),
-            PACKAGE=self.package_path,
-            APPLICATION=self.application_path,
-            TESTS=self.tests_path,
-            FIXTURES=self.fixtures_path,
-            VERSION=html_checker.__version__,
-            USER_AGENT=html_checker.USER_AGENT,
-        )
+        return path.format_map(self.variables)
 
 
 @pytest.fixture(scope='session')
@@ -52,12 +55,23 @@ def temp_builds_dir(tmpdir_factory):
     return fn
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def settings():
     """Initialize and return settings (mostly paths) for fixtures"""
     return FixturesSettingsTestMixin()
 
 
+@pytest.fixture(scope="session")
+def shared_validator():
+    """
+    Return a validator interface shared by every tests.
+
+    It must only be used from tests which do not change its attributes or
+    perform validations, others have to build their own instance.
+    """
+    return ValidatorInterface()
+
+
 @pytest.fixture(scope="module")
 def filter_export_payload():
     """